@@ -5,14 +5,25 @@
 и записывает их в базу данных PostgreSQL с заданной периодичностью.
 """
 
+import io
 import os
+import sys
+import logging
+import queue
+import signal
+import threading
 import time
 import random
 import math
-from datetime import datetime
-from decimal import Decimal
+import bisect
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from logging.handlers import RotatingFileHandler
+import numpy as np
 import psycopg2
-from psycopg2 import sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 
 # Конфигурация подключения к БД из переменных окружения
@@ -24,9 +35,38 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'weather_pass')
 }
 
+# Границы пула соединений с БД
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 8))
+
+# Режим synchronous_commit для сессий генератора. По умолчанию 'off':
+# коммит не ждёт сброса WAL на диск, и при сбое сервера могут потеряться
+# последние записи. Для демо-данных это допустимо; 'on' возвращает
+# стандартные гарантии PostgreSQL
+DB_SYNCHRONOUS_COMMIT = os.getenv('DB_SYNCHRONOUS_COMMIT', 'off')
+
 # Интервал генерации данных в секундах
 GENERATION_INTERVAL = int(os.getenv('GENERATION_INTERVAL', 1))
 
+# Максимальное число записей в одной пачке (одна транзакция на пачку)
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', 1000))
+
+# Максимальное время накопления пачки в секундах
+FLUSH_INTERVAL = float(os.getenv('FLUSH_INTERVAL', 1))
+
+# Пачки от этого размера записываются через COPY вместо INSERT
+COPY_THRESHOLD = int(os.getenv('COPY_THRESHOLD', 1000))
+
+# Сколько сгенерированных записей может ждать записи в БД
+QUEUE_SIZE = int(os.getenv('QUEUE_SIZE', 10000))
+
+# В консоль выводится каждая LOG_EVERY-я запись
+LOG_EVERY = int(os.getenv('LOG_EVERY', 60))
+
+# Файл с подробным журналом всех записей. По умолчанию выключен: с ним
+# каждая запись форматируется и пишется на диск, а не только каждая LOG_EVERY-я
+LOG_FILE = os.getenv('LOG_FILE', '')
+
 # Направления ветра
 WIND_DIRECTIONS = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
 
@@ -42,6 +82,164 @@ WEATHER_CONDITIONS = [
     ('Туман', 0.02)
 ]
 
+# Низкое давление и высокая влажность - вероятнее осадки
+WEATHER_CONDITIONS_LOW_PRESSURE = [
+    ('Пасмурно', 0.3),
+    ('Небольшой дождь', 0.3),
+    ('Дождь', 0.25),
+    ('Гроза', 0.1),
+    ('Туман', 0.05)
+]
+
+# Высокое давление - хорошая погода
+WEATHER_CONDITIONS_HIGH_PRESSURE = [
+    ('Ясно', 0.5),
+    ('Малооблачно', 0.35),
+    ('Облачно', 0.15)
+]
+
+
+# Таблица выбора состояния погоды: массивы для np.searchsorted в пачках
+# и те же данные списками для bisect в generate() - bisect по ndarray
+# упаковывает каждый проверяемый элемент в np.float64
+ConditionTable = namedtuple('ConditionTable', ['names', 'cum', 'names_list', 'cum_list'])
+
+
+def cumulative_weights(choices):
+    """Возвращает таблицу имён и накопленных весов, нормированных к 1.0"""
+    names = np.array([choice for choice, _ in choices], dtype=object)
+    cum = np.cumsum([weight for _, weight in choices])
+    cum = cum / cum[-1]
+    return ConditionTable(names, cum, names.tolist(), cum.tolist())
+
+
+# Таблицы выбора состояния погоды, вычисляемые один раз при импорте
+WEATHER_DEFAULT_CUM = cumulative_weights(WEATHER_CONDITIONS)
+WEATHER_LOW_CUM = cumulative_weights(WEATHER_CONDITIONS_LOW_PRESSURE)
+WEATHER_HIGH_CUM = cumulative_weights(WEATHER_CONDITIONS_HIGH_PRESSURE)
+
+# Одна запись погодных данных. Поля идут в порядке столбцов weather_data,
+# поэтому запись передаётся в запросы без перекладывания в кортеж.
+# Время генерации записывается явно: иначе все строки одной пачки получили
+# бы общее CURRENT_TIMESTAMP начала транзакции и потеряли бы порядок
+WeatherRecord = namedtuple('WeatherRecord', [
+    'timestamp',
+    'temperature',
+    'humidity',
+    'pressure',
+    'wind_speed',
+    'wind_direction',
+    'weather_condition'
+])
+
+# SQL-запросы собираются один раз из полей WeatherRecord, поэтому порядок
+# столбцов в запросах всегда совпадает с порядком полей записи
+WEATHER_COLUMNS = ", ".join(WeatherRecord._fields)
+ROW_PLACEHOLDERS = "(" + ", ".join(["%s"] * len(WeatherRecord._fields)) + ")"
+
+PREPARE_INSERT_SQL = (
+    f"PREPARE ins_weather AS INSERT INTO weather_data ({WEATHER_COLUMNS}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(WeatherRecord._fields) + 1))}) "
+    f"RETURNING id, timestamp"
+)
+EXECUTE_INSERT_SQL = f"EXECUTE ins_weather {ROW_PLACEHOLDERS}"
+INSERT_BATCH_SQL = f"INSERT INTO weather_data ({WEATHER_COLUMNS}) VALUES %s RETURNING id, timestamp"
+COPY_SQL = f"COPY weather_data ({WEATHER_COLUMNS}) FROM STDIN WITH CSV"
+
+
+@dataclass
+class WeatherBatch:
+    """Пачка погодных данных, хранимая по столбцам (поля - как у WeatherRecord)"""
+    timestamp: np.ndarray
+    temperature: np.ndarray
+    humidity: np.ndarray
+    pressure: np.ndarray
+    wind_speed: np.ndarray
+    wind_direction: np.ndarray
+    weather_condition: np.ndarray
+    
+    def __len__(self):
+        return len(self.temperature)
+    
+    def columns(self):
+        """Возвращает столбцы пачки в порядке столбцов weather_data"""
+        return (self.timestamp, self.temperature, self.humidity, self.pressure,
+                self.wind_speed, self.wind_direction, self.weather_condition)
+    
+    def records(self):
+        """Возвращает пачку в виде списка записей WeatherRecord"""
+        return list(map(WeatherRecord, *(column.tolist() for column in self.columns())))
+    
+    def to_csv(self):
+        """Форматирует пачку в CSV для COPY
+
+        Столбцы склеиваются обратно в строки, каждая строка - одна f-строка.
+        """
+        return records_to_csv(zip(*(column.tolist() for column in self.columns())))
+
+
+def records_to_csv(rows):
+    """Форматирует строки в порядке столбцов weather_data в CSV для COPY
+
+    Числа сразу пишутся с двумя знаками - как в столбцах DECIMAL(_, 2).
+    """
+    return "".join(f"{ts},{t:.2f},{h:.2f},{p:.2f},{ws:.2f},{wd},{wc}\n"
+                   for ts, t, h, p, ws, wd, wc in rows)
+
+
+logger = logging.getLogger('weather_generator')
+
+
+def _generate_kernel(base_t, base_h, base_p, base_w, dir_idx, n_directions,
+                     seasonal_factor, noise, uniform, n):
+    """Скомпилированный цикл пачки: те же шаги, что и в generate(), но без интерпретатора
+
+    noise - нормальный шум формы (8, n), uniform - равномерный шум формы (3, n).
+    Возвращает столбцы пачки и конечные базовые значения.
+    """
+    temperature = np.empty(n)
+    humidity = np.empty(n)
+    pressure = np.empty(n)
+    wind_speed = np.empty(n)
+    direction_idx = np.empty(n, dtype=np.int64)
+    
+    for i in range(n):
+        base_t = min(35.0, max(-10.0, base_t + noise[0, i] * 0.5 * 0.1))
+        temperature[i] = round(base_t + seasonal_factor * 5 + noise[1, i] * 0.3, 2)
+        
+        base_h = min(100.0, max(20.0, base_h + noise[2, i] * 0.2 - seasonal_factor))
+        humidity[i] = min(100.0, max(20.0, round(base_h + noise[3, i] * 2, 2)))
+        
+        base_p = min(1040.0, max(980.0, base_p + noise[4, i] * 0.3 * 0.05))
+        pressure[i] = round(base_p + noise[5, i] * 0.5, 2)
+        
+        base_w = min(20.0, max(0.0, base_w + noise[6, i] * 0.5 * 0.1))
+        gust = 1.5 if uniform[0, i] < 0.1 else 1.0
+        wind_speed[i] = min(25.0, max(0.0, round(base_w * gust + noise[7, i] * 0.3, 2)))
+        
+        if uniform[1, i] < 0.05:
+            dir_idx = (dir_idx + (1 if uniform[2, i] < 0.5 else -1)) % n_directions
+        direction_idx[i] = dir_idx
+    
+    return (temperature, humidity, pressure, wind_speed, direction_idx,
+            base_t, base_h, base_p, base_w, dir_idx)
+
+
+_compiled_kernel = None
+
+
+def _get_compiled_kernel():
+    """Компилирует _generate_kernel через numba при первом вызове
+
+    numba импортируется только здесь: в режиме по одной записи за такт
+    пачки не генерируются, и загрузка компилятора лишь замедлила бы запуск.
+    """
+    global _compiled_kernel
+    if _compiled_kernel is None:
+        import numba
+        _compiled_kernel = numba.njit(cache=True)(_generate_kernel)
+    return _compiled_kernel
+
 
 class WeatherDataGenerator:
     """Класс для генерации реалистичных погодных данных"""
@@ -54,29 +252,26 @@ class WeatherDataGenerator:
         self.base_wind_speed = random.uniform(1, 5)
         self.current_direction_idx = random.randint(0, len(WIND_DIRECTIONS) - 1)
         self.time_counter = 0
-        
-    def _get_seasonal_factor(self):
-        """Возвращает сезонный коэффициент на основе текущего времени"""
-        hour = datetime.now().hour
-        # Симуляция суточного цикла температуры
+        self.last_timestamp = None
+        self.rng = np.random.default_rng()
+        # Симуляция суточного цикла температуры по часам
         # Максимум около 14:00, минимум около 4:00
-        return math.sin((hour - 4) * math.pi / 12)
-    
-    def _weighted_choice(self, choices):
-        """Выбор элемента с учётом весов"""
-        total = sum(weight for _, weight in choices)
-        r = random.uniform(0, total)
-        upto = 0
-        for choice, weight in choices:
-            if upto + weight >= r:
-                return choice
-            upto += weight
-        return choices[-1][0]
+        self.seasonal_factors = [math.sin((hour - 4) * math.pi / 12) for hour in range(24)]
+        
+    def _get_seasonal_factor(self, now=None):
+        """Возвращает сезонный коэффициент для момента now (по умолчанию - текущего)"""
+        hour = (now or datetime.now()).hour
+        return self.seasonal_factors[hour]
+    
+    def _weighted_choice(self, table):
+        """Выбор элемента с учётом весов бинарным поиском по накопленным весам"""
+        return table.names_list[bisect.bisect_left(table.cum_list, random.random())]
     
     def generate(self):
         """Генерирует одну запись погодных данных"""
         self.time_counter += 1
-        seasonal_factor = self._get_seasonal_factor()
+        now = datetime.now().astimezone()
+        seasonal_factor = self._get_seasonal_factor(now)
         
         # Температура: -10 до +35°C с плавным изменением
         temperature_variation = random.gauss(0, 0.5)
@@ -115,125 +310,346 @@ class WeatherDataGenerator:
         
         # Состояние погоды: зависит от давления и влажности
         if pressure < 1000 and humidity > 70:
-            # Низкое давление и высокая влажность - вероятнее осадки
-            weather_choices = [
-                ('Пасмурно', 0.3),
-                ('Небольшой дождь', 0.3),
-                ('Дождь', 0.25),
-                ('Гроза', 0.1),
-                ('Туман', 0.05)
-            ]
+            weather_choices = WEATHER_LOW_CUM
         elif pressure > 1020:
-            # Высокое давление - хорошая погода
-            weather_choices = [
-                ('Ясно', 0.5),
-                ('Малооблачно', 0.35),
-                ('Облачно', 0.15)
-            ]
+            weather_choices = WEATHER_HIGH_CUM
         else:
-            weather_choices = WEATHER_CONDITIONS
+            weather_choices = WEATHER_DEFAULT_CUM
             
         weather_condition = self._weighted_choice(weather_choices)
         
-        return {
-            'temperature': temperature,
-            'humidity': humidity,
-            'pressure': pressure,
-            'wind_speed': wind_speed,
-            'wind_direction': wind_direction,
-            'weather_condition': weather_condition
-        }
+        return WeatherRecord(now, temperature, humidity, pressure,
+                             wind_speed, wind_direction, weather_condition)
+    
+    def _choose_conditions(self, table, n):
+        """Выбирает n состояний погоды с учётом весов одним вызовом searchsorted"""
+        return table.names[np.searchsorted(table.cum, self.rng.random(n))]
+    
+    def generate_batch(self, n, now=None):
+        """Генерирует пачку из n последовательных записей погодных данных
+
+        Сезонный коэффициент берётся один раз на всю пачку для момента now.
+        Записи пачки получают возрастающие с шагом в 1 мкс метки времени,
+        заканчивающиеся в now (и не раньше меток предыдущей пачки), чтобы
+        сортировка по timestamp сохраняла порядок генерации.
+
+        Весь шум пачки получается несколькими векторными вызовами NumPy,
+        а последовательное блуждание считается скомпилированным numba
+        _generate_kernel. Возвращает WeatherBatch без построчных объектов.
+        """
+        rng = self.rng
+        self.time_counter += n
+        now = now or datetime.now().astimezone()
+        seasonal_factor = self._get_seasonal_factor(now)
+        
+        step = timedelta(microseconds=1)
+        start = now - step * (n - 1)
+        if self.last_timestamp is not None and start <= self.last_timestamp:
+            start = self.last_timestamp + step
+        timestamp = np.array([start + step * i for i in range(n)], dtype=object)
+        self.last_timestamp = timestamp[-1]
+        
+        (temperature, humidity, pressure, wind_speed, direction_idx,
+         self.base_temperature, self.base_humidity, self.base_pressure,
+         self.base_wind_speed, self.current_direction_idx) = _get_compiled_kernel()(
+            self.base_temperature, self.base_humidity, self.base_pressure,
+            self.base_wind_speed, self.current_direction_idx, len(WIND_DIRECTIONS), seasonal_factor,
+            rng.standard_normal((8, n)), rng.random((3, n)), n)
+        wind_direction = np.array(WIND_DIRECTIONS)[direction_idx]
+        
+        # Состояние погоды: отдельная выборка для каждой группы давления
+        low = (pressure < 1000) & (humidity > 70)
+        high = (pressure > 1020) & ~low
+        default = ~(low | high)
+        weather_condition = np.empty(n, dtype=object)
+        weather_condition[low] = self._choose_conditions(WEATHER_LOW_CUM, low.sum())
+        weather_condition[high] = self._choose_conditions(WEATHER_HIGH_CUM, high.sum())
+        weather_condition[default] = self._choose_conditions(WEATHER_DEFAULT_CUM, default.sum())
+        
+        return WeatherBatch(timestamp, temperature, humidity, pressure,
+                            wind_speed, wind_direction, weather_condition)
+
+
+class WeatherConnectionPool(ThreadedConnectionPool):
+    """Пул соединений, настраивающий каждое новое соединение один раз"""
+    
+    def _connect(self, key=None):
+        conn = super()._connect(key)
+        # Каждая пачка пишется одним выражением, поэтому отдельные
+        # BEGIN/COMMIT не нужны: транзакция укладывается в один запрос
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = %s", (DB_SYNCHRONOUS_COMMIT,))
+        prepare_statements(conn)
+        return conn
 
 
 def connect_to_db():
-    """Создаёт подключение к базе данных с повторными попытками"""
+    """Создаёт пул подключений к базе данных с повторными попытками"""
     max_retries = 30
     retry_delay = 2
     
     for attempt in range(max_retries):
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
-            print(f"✓ Успешное подключение к базе данных на попытке {attempt + 1}")
-            return conn
+            pool = WeatherConnectionPool(DB_POOL_MIN, DB_POOL_MAX, **DB_CONFIG)
+            logger.info(f"✓ Успешное подключение к базе данных на попытке {attempt + 1}")
+            return pool
         except psycopg2.OperationalError as e:
-            print(f"⏳ Попытка {attempt + 1}/{max_retries}: База данных недоступна. Ожидание {retry_delay} сек...")
+            logger.warning(f"⏳ Попытка {attempt + 1}/{max_retries}: База данных недоступна. Ожидание {retry_delay} сек...")
             time.sleep(retry_delay)
     
     raise Exception("Не удалось подключиться к базе данных после всех попыток")
 
 
+def prepare_statements(conn):
+    """Подготавливает на сервере выражение для вставки одной записи
+
+    Подготовленное выражение живёт до закрытия сессии, поэтому
+    разбор и планирование запроса выполняются один раз.
+    """
+    with conn.cursor() as cur:
+        cur.execute(PREPARE_INSERT_SQL)
+
+
 def insert_weather_data(conn, data):
-    """Вставляет запись погодных данных в БД"""
-    query = """
-        INSERT INTO weather_data 
-        (temperature, humidity, pressure, wind_speed, wind_direction, weather_condition)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        RETURNING id, timestamp
+    """Вставляет одну запись погодных данных через подготовленное выражение"""
+    with conn.cursor() as cur:
+        cur.execute(EXECUTE_INSERT_SQL, data)
+        return cur.fetchone()
+
+
+def insert_weather_batch(conn, rows):
+    """Вставляет пачку записей погодных данных в БД одним запросом
+
+    Возвращает список пар (id, timestamp) в порядке следования записей.
     """
-    
     with conn.cursor() as cur:
-        cur.execute(query, (
-            data['temperature'],
-            data['humidity'],
-            data['pressure'],
-            data['wind_speed'],
-            data['wind_direction'],
-            data['weather_condition']
-        ))
-        result = cur.fetchone()
-        conn.commit()
+        result = execute_values(
+            cur, INSERT_BATCH_SQL, rows,
+            template=ROW_PLACEHOLDERS,
+            page_size=len(rows),
+            fetch=True
+        )
         return result
 
 
+def insert_weather_copy(conn, rows):
+    """Записывает пачку (WeatherBatch или список WeatherRecord) в БД через COPY одним запросом
+
+    COPY не поддерживает RETURNING, поэтому возвращается только
+    количество записанных строк.
+    """
+    if isinstance(rows, WeatherBatch):
+        buf = io.StringIO(rows.to_csv())
+    else:
+        buf = io.StringIO(records_to_csv(rows))
+    
+    with conn.cursor() as cur:
+        cur.copy_expert(COPY_SQL, buf)
+        return cur.rowcount
+
+
+def setup_logging():
+    """Настраивает краткий вывод в консоль и подробный журнал в файл"""
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(console)
+    logger.setLevel(logging.INFO)
+    
+    if LOG_FILE:
+        file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10 * 1024 * 1024,
+                                           backupCount=3, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        logger.addHandler(file_handler)
+        logger.setLevel(logging.DEBUG)
+
+
+def format_record(record_id, timestamp, data):
+    """Форматирует запись погодных данных для журнала"""
+    return (f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] "
+            f"ID:{record_id:6d} | "
+            f"🌡️ {data.temperature:+6.1f}°C | "
+            f"💧 {data.humidity:5.1f}% | "
+            f"📊 {data.pressure:7.1f} гПа | "
+            f"💨 {data.wind_speed:4.1f} м/с {data.wind_direction:2s} | "
+            f"☁️ {data.weather_condition}")
+
+
+class WeatherWriter(threading.Thread):
+    """Поток, записывающий в БД записи из очереди пачками
+
+    Генератор кладёт в очередь списки записей WeatherRecord или готовые
+    пачки WeatherBatch и не ждёт БД: задержка
+    коммита лишь накапливает очередь, которая уйдёт следующей пачкой.
+    None в очереди означает остановку после записи накопленного.
+    """
+    
+    def __init__(self, pool, records):
+        super().__init__(name='weather-writer', daemon=True)
+        self.pool = pool
+        self.records = records
+        self.records_count = 0
+    
+    def run(self):
+        batch = []
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        stopping = False
+        # Если такт не короче окна накопления, ждать следующих записей
+        # бессмысленно: каждая запись пишется сразу, как только очередь пуста
+        flush_when_drained = GENERATION_INTERVAL >= FLUSH_INTERVAL
+        
+        while not stopping:
+            drained = False
+            try:
+                chunk = self.records.get(timeout=max(0, deadline - time.monotonic()))
+                # Забираем всё, что уже накопилось, но не больше пачки
+                while chunk is not None:
+                    if isinstance(chunk, WeatherBatch):
+                        # Пачка по столбцам записывается как есть, без разбора на записи
+                        self.flush(batch)
+                        batch = []
+                        self.flush(chunk)
+                    else:
+                        batch.extend(chunk)
+                    if len(batch) >= BATCH_SIZE:
+                        break
+                    try:
+                        chunk = self.records.get_nowait()
+                    except queue.Empty:
+                        drained = True
+                        break
+                stopping = chunk is None
+            except queue.Empty:
+                pass
+            
+            # Вставка в БД: по заполнению пачки, по опустошению очереди
+            # (см. flush_when_drained) или по истечении FLUSH_INTERVAL
+            if (stopping or len(batch) >= BATCH_SIZE or (drained and flush_when_drained)
+                    or time.monotonic() >= deadline):
+                self.flush(batch)
+                batch = []
+                deadline = time.monotonic() + FLUSH_INTERVAL
+    
+    def flush(self, batch):
+        """Записывает пачку (список записей или WeatherBatch) в БД и выводит её содержимое"""
+        if not len(batch):
+            return
+        
+        previous_count = self.records_count
+        
+        # COPY принимает и столбцы, и записи; построчной вставке нужны записи
+        if len(batch) < COPY_THRESHOLD and isinstance(batch, WeatherBatch):
+            batch = batch.records()
+        
+        conn = self.pool.getconn()
+        try:
+            if len(batch) >= COPY_THRESHOLD:
+                copied = insert_weather_copy(conn, batch)
+            elif len(batch) == 1:
+                results = [insert_weather_data(conn, batch[0])]
+            else:
+                results = insert_weather_batch(conn, batch)
+        finally:
+            self.pool.putconn(conn)
+        
+        if len(batch) >= COPY_THRESHOLD:
+            # Крупные пачки: COPY без построчного вывода
+            self.records_count += copied
+            logger.info(f"📦 Записана пачка из {len(batch)} записей через COPY")
+        else:
+            for weather_data, (record_id, timestamp) in zip(batch, results):
+                self.records_count += 1
+                
+                # Каждая запись - в файл, каждая LOG_EVERY-я - ещё и в консоль.
+                # Строка форматируется, только если её кто-то запишет.
+                level = logging.INFO if self.records_count % LOG_EVERY == 0 else logging.DEBUG
+                if logger.isEnabledFor(level):
+                    logger.log(level, format_record(record_id, timestamp, weather_data))
+        
+        # Периодический вывод статистики (каждые 60 записей)
+        if self.records_count // 60 > previous_count // 60:
+            logger.info(f"\n📈 Статистика: сгенерировано {self.records_count} записей\n")
+    
+    def put(self, chunk):
+        """Кладёт записи в очередь, пока поток записи жив"""
+        while True:
+            try:
+                self.records.put(chunk, timeout=1)
+                return
+            except queue.Full:
+                if not self.is_alive():
+                    raise Exception("Поток записи в БД завершился с ошибкой")
+
+
+def stop_on_sigterm(signum, frame):
+    """Обрабатывает SIGTERM (docker stop) так же, как Ctrl+C"""
+    raise KeyboardInterrupt
+
+
 def main():
     """Основная функция генератора данных"""
-    print("=" * 60)
-    print("🌤️  Генератор данных погодной станции")
-    print("=" * 60)
-    print(f"Подключение к БД: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['dbname']}")
-    print(f"Интервал генерации: {GENERATION_INTERVAL} сек")
-    print("=" * 60)
+    setup_logging()
+    
+    logger.info("=" * 60)
+    logger.info("🌤️  Генератор данных погодной станции")
+    logger.info("=" * 60)
+    logger.info(f"Подключение к БД: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['dbname']}")
+    logger.info(f"Интервал генерации: {GENERATION_INTERVAL} сек")
+    logger.info(f"Размер пачки: до {BATCH_SIZE} записей, не реже раза в {FLUSH_INTERVAL} сек")
+    logger.info("=" * 60)
     
     # Подключение к БД
-    conn = connect_to_db()
+    pool = connect_to_db()
     
     # Создание генератора
     generator = WeatherDataGenerator()
     
-    records_count = 0
+    # Без паузы генерируются целые пачки, иначе - по одной записи за такт
+    chunk_size = BATCH_SIZE if GENERATION_INTERVAL == 0 else 1
+    writer = WeatherWriter(pool, queue.Queue(maxsize=max(1, QUEUE_SIZE // chunk_size)))
+    writer.start()
+    
+    # docker compose stop/down шлёт SIGTERM: без обработчика процесс будет
+    # убит по таймауту, и записи из очереди не попадут в БД
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
     
     try:
-        print("\n📊 Начало генерации данных...\n")
+        logger.info("\n📊 Начало генерации данных...\n")
+        next_tick = time.monotonic()
         
         while True:
-            # Генерация данных
-            weather_data = generator.generate()
+            if not writer.is_alive():
+                raise Exception("Поток записи в БД завершился с ошибкой")
             
-            # Вставка в БД
-            record_id, timestamp = insert_weather_data(conn, weather_data)
-            records_count += 1
-            
-            # Вывод информации
-            print(f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] "
-                  f"ID:{record_id:6d} | "
-                  f"🌡️ {weather_data['temperature']:+6.1f}°C | "
-                  f"💧 {weather_data['humidity']:5.1f}% | "
-                  f"📊 {weather_data['pressure']:7.1f} гПа | "
-                  f"💨 {weather_data['wind_speed']:4.1f} м/с {weather_data['wind_direction']:2s} | "
-                  f"☁️ {weather_data['weather_condition']}")
-            
-            # Периодический вывод статистики
-            if records_count % 60 == 0:
-                print(f"\n📈 Статистика: сгенерировано {records_count} записей\n")
+            # Генерация данных
+            if GENERATION_INTERVAL == 0:
+                # Без паузы пачка генерируется целиком векторными операциями
+                writer.put(generator.generate_batch(chunk_size))
+            else:
+                writer.put([generator.generate()])
             
-            # Ожидание перед следующей генерацией
-            time.sleep(GENERATION_INTERVAL)
+            # Ожидание следующего такта: сроки отсчитываются от расписания,
+            # а не от конца работы, поэтому период не накапливает задержку
+            next_tick += GENERATION_INTERVAL
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -GENERATION_INTERVAL:
+                # Отстали больше чем на такт - пропущенные такты отбрасываются
+                next_tick = time.monotonic()
             
     except KeyboardInterrupt:
-        print(f"\n\n⚠️ Генератор остановлен. Всего записей: {records_count}")
+        # Дожидаемся записи всего, что уже стоит в очереди;
+        # повторный SIGTERM не должен прерывать запись
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        writer.put(None)
+        writer.join()
+        logger.warning(f"\n\n⚠️ Генератор остановлен. Всего записей: {writer.records_count}")
     finally:
-        conn.close()
-        print("🔌 Соединение с БД закрыто")
+        pool.closeall()
+        logger.info("🔌 Соединение с БД закрыто")
 
 
 if __name__ == "__main__":